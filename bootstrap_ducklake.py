@@ -1,31 +1,63 @@
 #!/usr/bin/env python3
 import argparse
+import copy
+import functools
+import json
 import os
 import sys
-from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
-import urllib.request
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple
 
 
-import duckdb  # pip install duckdb
-import yaml    # pip install pyyaml
+import duckdb    # pip install duckdb
+import requests  # pip install requests
+import yaml      # pip install pyyaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from tqdm import tqdm  # optional: download progress bar
+except ImportError:
+    tqdm = None
+
+try:
+    from yaml import CSafeLoader as _Loader  # libyaml-backed, much faster
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 # --------------------------
 # Config & backend adapters
 # --------------------------
 
-@dataclass
+def sql_literal(value: Any) -> str:
+    # CREATE SECRET and ATTACH don't accept ? parameters, so values are inlined
+    # as properly escaped string literals instead of raw f-string interpolation.
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+@dataclass(frozen=True, slots=True)
 class MetadataDuckDB:
     file_path: str
 
     def attach_sql(self, alias: str, data_path: str) -> str:
-        # ATTACH ducklake with DuckDB metadata file
-        # Example:
-        #   ATTACH 'ducklake:metadata.ducklake' AS alias (DATA_PATH 's3://bucket/prefix/');
-        return f"ATTACH 'ducklake:{self.file_path}' AS {alias} (DATA_PATH '{data_path}');"
+        return _attach_sql(self, alias, data_path)
+
+
+@functools.lru_cache(maxsize=4)
+def _attach_sql(meta: MetadataDuckDB, alias: str, data_path: str) -> str:
+    # ATTACH ducklake with DuckDB metadata file
+    # Example:
+    #   ATTACH 'ducklake:metadata.ducklake' AS alias (DATA_PATH 's3://bucket/prefix/');
+    return (
+        f"ATTACH {sql_literal('ducklake:' + meta.file_path)} AS {alias} "
+        f"(DATA_PATH {sql_literal(data_path)});"
+    )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StorageMinIO:
     bucket: str
     prefix: str
@@ -37,48 +69,78 @@ class StorageMinIO:
     url_style: str = "path"
 
     def data_path(self) -> str:
-        # S3-style path DuckDB understands
-        prefix = self.prefix.strip("/")
-        if prefix:
-            return f"s3://{self.bucket}/{prefix}/"
-        return f"s3://{self.bucket}/"
+        return _data_path(self)
 
     def create_secret_sql(self, name: str = "minio") -> str:
-        # We rely on DuckDB's S3 Secret provider. For MinIO we typically set:
-        # ENDPOINT, URL_STYLE, USE_SSL plus creds & region.
-        # You can also omit creds here and rely on env or credential_chain.
-        parts = [
-            "CREATE OR REPLACE SECRET {name} (",
-            "  TYPE S3,",
-        ]
-        if self.access_key and self.secret_key:
-            parts.append(f"  KEY_ID '{self.access_key}',")
-            parts.append(f"  SECRET '{self.secret_key}',")
-        parts.append(f"  ENDPOINT '{self.endpoint.replace('http://','').replace('https://','')}',")
-        parts.append(f"  URL_STYLE '{self.url_style}',")
-        parts.append(f"  USE_SSL {'true' if self.use_ssl else 'false'},")
-        parts.append(f"  REGION '{self.region}'")
-        parts.append(");")
-        sql = "\n".join(parts).format(name=name)
-        return sql
-
-
-@dataclass
+        return _create_secret_sql(self, name)
+
+
+# Config objects are frozen (hashable), so the generated SQL/paths are memoized
+# per instance and reused when several commands run in one process.
+@functools.lru_cache(maxsize=4)
+def _create_secret_sql(storage: StorageMinIO, name: str) -> str:
+    # We rely on DuckDB's S3 Secret provider. For MinIO we typically set:
+    # ENDPOINT, URL_STYLE, USE_SSL plus creds & region.
+    # You can also omit creds here and rely on env or credential_chain.
+    parts = [
+        f"CREATE OR REPLACE SECRET {name} (",
+        "  TYPE S3,",
+    ]
+    if storage.access_key and storage.secret_key:
+        parts.append(f"  KEY_ID {sql_literal(storage.access_key)},")
+        parts.append(f"  SECRET {sql_literal(storage.secret_key)},")
+    parts.append(f"  ENDPOINT {sql_literal(storage.endpoint.replace('http://','').replace('https://',''))},")
+    parts.append(f"  URL_STYLE {sql_literal(storage.url_style)},")
+    parts.append(f"  USE_SSL {'true' if storage.use_ssl else 'false'},")
+    parts.append(f"  REGION {sql_literal(storage.region)}")
+    parts.append(");")
+    return "\n".join(parts)
+
+
+@functools.lru_cache(maxsize=4)
+def _data_path(storage: StorageMinIO) -> str:
+    # S3-style path DuckDB understands
+    prefix = storage.prefix.strip("/")
+    if prefix:
+        return f"s3://{storage.bucket}/{prefix}/"
+    return f"s3://{storage.bucket}/"
+
+
+@dataclass(frozen=True, slots=True)
 class CatalogConfig:
     alias: str = "my_ducklake"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TPCHConfig:
     default_scale: int = 1
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class DuckDBConfig:
+    # None leaves DuckDB's own default in place
+    threads: Optional[int] = None
+    memory_limit: Optional[str] = None
+    http_retries: Optional[int] = None
+
+    def settings_sql(self) -> str:
+        stmts = []
+        if self.threads:
+            stmts.append(f"SET threads = {int(self.threads)};")
+        if self.memory_limit:
+            stmts.append(f"SET memory_limit = {sql_literal(self.memory_limit)};")
+        if self.http_retries is not None:
+            stmts.append(f"SET http_retries = {int(self.http_retries)};")
+        return " ".join(stmts)
+
+
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     metadata: MetadataDuckDB
     storage: StorageMinIO
     catalog: CatalogConfig
     tpch: TPCHConfig
+    duckdb: DuckDBConfig = field(default_factory=DuckDBConfig)
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "AppConfig":
@@ -86,6 +148,7 @@ class AppConfig:
         st = d.get("storage", {})
         cg = d.get("catalog", {})
         tp = d.get("tpch", {})
+        db = d.get("duckdb") or {}
 
         storage = StorageMinIO(
             bucket=st.get("bucket", "ducklake-data"),
@@ -108,7 +171,12 @@ class AppConfig:
             metadata=MetadataDuckDB(file_path=md.get("duckdb_file", "./metadata.ducklake")),
             storage=storage,
             catalog=CatalogConfig(alias=cg.get("alias", "my_ducklake")),
-            tpch=TPCHConfig(default_scale=int(tp.get("default_scale", 1)))
+            tpch=TPCHConfig(default_scale=int(tp.get("default_scale", 1))),
+            duckdb=DuckDBConfig(
+                threads=db.get("threads"),
+                memory_limit=db.get("memory_limit"),
+                http_retries=db.get("http_retries"),
+            ),
         )
 
 
@@ -116,66 +184,204 @@ class AppConfig:
 # DuckDB helpers
 # --------------------------
 
+EXTENSIONS = ("httpfs", "aws", "ducklake", "tpch")
+
+
+def extensions_sql(con: duckdb.DuckDBPyConnection, names: Sequence[str] = EXTENSIONS) -> str:
+    # INSTALL only what's missing (it touches the extension dir / network even
+    # when already present), always LOAD; one batched statement.
+    installed = {r[0] for r in con.execute(
+        "SELECT extension_name FROM duckdb_extensions() WHERE installed;"
+    ).fetchall()}
+    stmts = [f"INSTALL {ext};" for ext in names if ext not in installed]
+    stmts += [f"LOAD {ext};" for ext in names]
+    return " ".join(stmts)
+
+
 def open_duckdb_for_session(cfg: AppConfig) -> duckdb.DuckDBPyConnection:
     os.makedirs(os.path.dirname(cfg.metadata.file_path) or ".", exist_ok=True)
     con = duckdb.connect(database=cfg.metadata.file_path)
-
-    # Install/load needed extensions. INSTALL is idempotent.
-    con.execute("INSTALL httpfs; LOAD httpfs;")
-    con.execute("INSTALL aws; LOAD aws;")
-    con.execute("INSTALL ducklake; LOAD ducklake;")
-    con.execute("INSTALL tpch; LOAD tpch;")
+    con.execute(extensions_sql(con) + " " + cfg.duckdb.settings_sql())
     return con
 
 
-def ensure_minio_secret(con: duckdb.DuckDBPyConnection, storage: StorageMinIO, secret_name: str = "minio") -> None:
-    sql = storage.create_secret_sql(secret_name)
-    con.execute(sql)
-
-
 def attach_ducklake(con: duckdb.DuckDBPyConnection, cfg: AppConfig) -> None:
     # Make sure the metadata dir exists on disk for the DuckDB file path
     md_dir = os.path.dirname(os.path.abspath(cfg.metadata.file_path)) or "."
     os.makedirs(md_dir, exist_ok=True)
 
-    # Configure S3/MinIO access
-    ensure_minio_secret(con, cfg.storage)
-
-    # ATTACH ducklake
+    # Configure S3/MinIO access, ATTACH ducklake and use it, as a single batch
     data_path = cfg.storage.data_path()
-    attach_sql = cfg.metadata.attach_sql(alias=cfg.catalog.alias, data_path=data_path)
-    con.execute(attach_sql)
-    # Use the attached catalog
-    con.execute(f"USE {cfg.catalog.alias};")
+    con.execute("\n".join([
+        cfg.storage.create_secret_sql("minio"),
+        cfg.metadata.attach_sql(alias=cfg.catalog.alias, data_path=data_path),
+        f"USE {cfg.catalog.alias};",
+    ]))
+    tune_http(con)
+
+
+# Data-movement settings for S3/MinIO reads: reuse HTTP connections and cache
+# Parquet footers/metadata so repeated scans don't re-fetch them. These cut
+# request overhead; they don't change any query plan.
+HTTP_TUNING = {
+    "http_keep_alive": "true",
+    "enable_object_cache": "true",
+    "parquet_metadata_cache": "true",
+}
+
+
+def tune_http(con: duckdb.DuckDBPyConnection) -> None:
+    # Setting names vary across DuckDB versions; only apply the ones this build knows
+    known = {r[0] for r in con.execute(
+        "SELECT name FROM duckdb_settings() WHERE name IN ("
+        + ", ".join(sql_literal(n) for n in HTTP_TUNING) + ");"
+    ).fetchall()}
+    stmts = [f"SET {n} = {v};" for n, v in HTTP_TUNING.items() if n in known]
+    if stmts:
+        con.execute(" ".join(stmts))
+
+
+# Shared HTTP session: keeps connections alive across redirects and retries, and
+# retries transient gateway errors with exponential backoff.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+))
+
+
+def download_file(url: str, dest: str, chunk_size: int = 1024 * 1024) -> None:
+    """
+    Streams url to dest in chunk_size pieces. Writes to dest + ".part" and renames
+    on success, so an interrupted download never leaves a truncated dest behind.
+    """
+    tmp = dest + ".part"
+    try:
+        with _SESSION.get(url, stream=True, timeout=(5, 30)) as r:
+            r.raise_for_status()
+            total = int(r.headers.get("Content-Length", 0))
+            bar = tqdm(total=total or None, unit="B", unit_scale=True, desc=dest) if tqdm else None
+            try:
+                with open(tmp, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=chunk_size):
+                        if chunk:
+                            f.write(chunk)
+                            if bar:
+                                bar.update(len(chunk))
+            finally:
+                if bar:
+                    bar.close()
+        os.replace(tmp, dest)
+    except BaseException:
+        # Don't leave a partial file behind (including on Ctrl-C)
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+@contextmanager
+def session(cfg: AppConfig) -> Iterator[duckdb.DuckDBPyConnection]:
+    """
+    Yields a connection with extensions loaded, settings applied and the DuckLake
+    catalog attached; closes it on exit.
+    """
+    con = open_duckdb_for_session(cfg)
+    try:
+        attach_ducklake(con, cfg)
+        yield con
+    finally:
+        con.close()
 
 
+def tpch_dataset(scale: int) -> Tuple[str, str]:
+    # (download URL, local file path) of the pre-generated TPC-H database
+    return f"https://blobs.duckdb.org/data/tpch-sf{scale}.db", f"tpch-sf{scale}.duckdb"
 
-def generate_tpch_and_load(con, scale: int, ducklake_alias: str):
+
+def attach_tpch_source(con: duckdb.DuckDBPyConnection, location: str) -> None:
+    con.execute(f"ATTACH {sql_literal(location)} AS tpch_src (READ_ONLY);")
+
+
+def generate_tpch_and_load(con, scale: int, ducklake_alias: str, keep_local: bool = False):
     """
-    Downloads a pre-generated TPC-H dataset (if missing) and copies it into DuckLake.
+    Attaches a pre-generated TPC-H dataset and copies it into DuckLake. A local copy
+    (tpch-sfN.duckdb) is always reused if present. Otherwise, with keep_local the
+    dataset is downloaded once and kept, so later loads and run_tpch_queries.py
+    (which validates against that local file) don't fetch it again; without it,
+    the dataset is read remotely over HTTP with no staging copy, falling back to
+    a download if the remote attach fails.
     """
-    # Determine dataset URL and local file path
-    url = f"https://blobs.duckdb.org/data/tpch-sf{scale}.db"
-    local_db = f"tpch-sf{scale}.duckdb"
-
-    # Download only if missing
-    if not os.path.exists(local_db):
-        print(f"[+] Downloading TPC-H scale factor {scale} dataset from {url} ...")
-        urllib.request.urlretrieve(url, local_db)
-        print(f"[✓] Download complete: {local_db}")
-    else:
-        print(f"[skip] Using cached dataset: {local_db}")
-
-    # Attach DuckLake and TPC-H databases
-    print(f"[+] Attaching TPC-H database...")
-    con.execute(f"ATTACH '{local_db}' AS tpch_src;")
-
-    # Copy all tables into DuckLake
-    print(f"[+] Copying tables from TPC-H dataset into DuckLake catalog...")
-    con.execute(f"COPY FROM DATABASE tpch_src TO {ducklake_alias};")
-
-    # Clean up
-    con.execute("DETACH DATABASE tpch_src;")
+    url, local_db = tpch_dataset(scale)
+
+    # Attach the TPC-H source database (read-only; we never write to it)
+    use_local = keep_local or os.path.exists(local_db)
+    if not use_local:
+        try:
+            print(f"[+] Attaching remote TPC-H scale factor {scale} dataset at {url} ...")
+            attach_tpch_source(con, url)
+        except duckdb.Error as e:
+            print(f"[!] Remote attach failed ({e}); downloading instead")
+            use_local = True
+
+    if use_local:
+        if os.path.exists(local_db):
+            print(f"[skip] Using cached dataset: {local_db}")
+        else:
+            print(f"[+] Downloading TPC-H scale factor {scale} dataset from {url} ...")
+            download_file(url, local_db)
+            print(f"[✓] Download complete: {local_db}")
+        print(f"[+] Attaching TPC-H database...")
+        attach_tpch_source(con, local_db)
+
+    tables = [r[0] for r in con.execute(
+        "SELECT table_name FROM information_schema.tables "
+        "WHERE table_catalog = 'tpch_src' AND table_schema = 'main' ORDER BY table_name;"
+    ).fetchall()]
+
+    # Copy tables concurrently, one cursor per table, instead of funnelling all of
+    # them through the single writer used by COPY FROM DATABASE.
+    print(f"[+] Copying {len(tables)} tables from TPC-H dataset into DuckLake catalog...")
+    threads = int(con.execute("SELECT current_setting('threads');").fetchone()[0])
+
+    def copy_table(t: str) -> Tuple[str, Optional[BaseException]]:
+        # Replace and fill each table in one transaction: a failed insert rolls
+        # back to the previous table contents rather than leaving it empty.
+        cur = con.cursor()
+        try:
+            cur.begin()
+            try:
+                cur.execute(
+                    f"CREATE OR REPLACE TABLE {ducklake_alias}.main.{t} AS "
+                    f"SELECT * FROM tpch_src.main.{t} LIMIT 0;"
+                )
+                cur.execute(f"INSERT INTO {ducklake_alias}.main.{t} SELECT * FROM tpch_src.main.{t};")
+                cur.commit()
+            except Exception:
+                cur.rollback()
+                raise
+        except Exception as e:
+            return t, e
+        finally:
+            cur.close()
+        return t, None
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, threads // 2)) as pool:
+            results = list(pool.map(copy_table, tables))
+    finally:
+        con.execute("DETACH DATABASE tpch_src;")
+
+    # Tables are replaced independently, so report exactly which ones made it
+    failed = [(t, e) for t, e in results if e is not None]
+    for t, e in results:
+        print(f"    {t:>9}: {'replaced' if e is None else f'FAILED ({e})'}")
+    if failed:
+        raise RuntimeError(
+            f"{len(failed)} of {len(tables)} tables failed to load "
+            f"({', '.join(t for t, _ in failed)}); the others were replaced at scale {scale}, "
+            "so the catalog may mix old and new data. Re-run load-tpch to finish."
+        )
     print("[✓] TPC-H dataset successfully loaded into DuckLake.")
 
 
@@ -183,39 +389,99 @@ def generate_tpch_and_load(con, scale: int, ducklake_alias: str):
 # CLI
 # --------------------------
 
-def load_config(path: str) -> AppConfig:
+def _config_cache_path(path: str) -> str:
+    # Sibling of the YAML file, e.g. ./.config.yaml.cache.json
+    head, tail = os.path.split(path)
+    return os.path.join(head, f".{tail}.cache.json")
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(path: str, sig: tuple) -> Dict[str, Any]:
+    # sig = (st_mtime_ns, st_size, st_ino) of the YAML file; a change in any
+    # of them invalidates both this in-process cache and the on-disk one.
+    cache_path = _config_cache_path(path)
+    try:
+        with open(cache_path, "r") as f:
+            if json.loads(f.readline()) == list(sig):
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
     with open(path, "r") as f:
-        data = yaml.safe_load(f)
-    return AppConfig.from_dict(data)
+        data = yaml.load(f, Loader=_Loader)
+
+    # Only cache what survives a JSON round trip unchanged (e.g. YAML int keys
+    # or dates would come back as strings on the next hit)
+    try:
+        if json.loads(json.dumps(data)) != data:
+            return data
+    except (TypeError, ValueError):
+        return data
+
+    # Best effort: rewrite the JSON cache atomically (temp file + rename)
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(json.dumps(list(sig)) + "\n")
+            json.dump(data, f)
+        os.replace(tmp, cache_path)
+    except OSError:
+        if tmp and os.path.exists(tmp):
+            os.unlink(tmp)
+    return data
+
+
+def read_config_cached(path: str) -> Dict[str, Any]:
+    st = os.stat(path)
+    data = _parse_config(os.path.abspath(path), (st.st_mtime_ns, st.st_size, st.st_ino))
+    # The lru_cache'd dict is shared; hand each caller its own copy
+    return copy.deepcopy(data)
+
+
+def load_config(path: str) -> AppConfig:
+    return AppConfig.from_dict(read_config_cached(path))
 
 
 def cmd_attach(args):
     cfg = load_config(args.config)
-    con = open_duckdb_for_session(cfg)
-    attach_ducklake(con, cfg)
-    # Show summary
-    data_path = cfg.storage.data_path()
-    print(f"Attached DuckLake catalog '{cfg.catalog.alias}'")
-    print(f"  metadata: {cfg.metadata.file_path}")
-    print(f"  data_path: {data_path}")
-    # Confirm we can create a tiny table
-    con.execute("CREATE TABLE IF NOT EXISTS bootstrap_check(x INTEGER);")
-    print("Sanity: created table 'bootstrap_check' in DuckLake catalog")
+    with session(cfg) as con:
+        # Show summary
+        data_path = cfg.storage.data_path()
+        print(f"Attached DuckLake catalog '{cfg.catalog.alias}'")
+        print(f"  metadata: {cfg.metadata.file_path}")
+        print(f"  data_path: {data_path}")
+        # Confirm we can create a tiny table
+        con.execute("CREATE TABLE IF NOT EXISTS bootstrap_check(x INTEGER);")
+        print("Sanity: created table 'bootstrap_check' in DuckLake catalog")
 
 
 def cmd_load_tpch(args):
     cfg = load_config(args.config)
-    con = open_duckdb_for_session(cfg)
-    attach_ducklake(con, cfg)
-    scale = args.scale or cfg.tpch.default_scale
-    generate_tpch_and_load(con, scale, cfg.catalog.alias)
-    # Count a couple of tables
-    for t in ["region", "nation", "customer", "orders", "lineitem"]:
+    with session(cfg) as con:
+        scale = args.scale or cfg.tpch.default_scale
         try:
-            cnt = con.execute(f"SELECT COUNT(*) FROM {t};").fetchone()[0]
-            print(f"{t:>9}: {cnt:,}")
-        except Exception as e:
-            print(f"{t:>9}: (not found)")
+            generate_tpch_and_load(con, scale, cfg.catalog.alias, keep_local=args.keep_local)
+        except RuntimeError as e:
+            print(f"[error] {e}", file=sys.stderr)
+            sys.exit(1)
+        # Count a couple of tables in one round trip
+        check = ["region", "nation", "customer", "orders", "lineitem"]
+        existing = {r[0] for r in con.execute(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_catalog = current_database() AND table_schema = 'main';"
+        ).fetchall()}
+        present = [t for t in check if t in existing]
+        counts = {}
+        if present:
+            counts = dict(con.execute(" UNION ALL ".join(
+                f"SELECT '{t}', COUNT(*) FROM {t}" for t in present
+            ) + ";").fetchall())
+        for t in check:
+            if t in counts:
+                print(f"{t:>9}: {counts[t]:,}")
+            else:
+                print(f"{t:>9}: (not found)")
     print("Done.")
 
 
@@ -225,7 +491,7 @@ def cmd_init_config(args):
         print(f"{target} already exists (use --force to overwrite)", file=sys.stderr)
         return        
     with open(target, "w") as f:
-        f.write("""metadata:\n  duckdb_file: "./metadata.ducklake"\n\nstorage:\n  type: "minio"\n  bucket: "ducklake-data"\n  prefix: "tpch/"\n  endpoint: "http://localhost:9000"\n  region: "us-east-1"\n  use_ssl: false\n  url_style: "path"\n\ncatalog:\n  alias: "my_ducklake"\n\ntpch:\n  default_scale: 1\n""")
+        f.write("""metadata:\n  duckdb_file: "./metadata.ducklake"\n\nstorage:\n  type: "minio"\n  bucket: "ducklake-data"\n  prefix: "tpch/"\n  endpoint: "http://localhost:9000"\n  region: "us-east-1"\n  use_ssl: false\n  url_style: "path"\n\ncatalog:\n  alias: "my_ducklake"\n\ntpch:\n  default_scale: 1\n\nduckdb:\n  http_retries: 5\n""")
     print(f"Wrote {target}")
 
 
@@ -240,6 +506,9 @@ def main():
     p_tpch = sub.add_parser("load-tpch", help="Generate TPC-H data using DuckDB 'tpch' and load into DuckLake")
     p_tpch.add_argument("--config", default="config.yaml", help="Path to config file")
     p_tpch.add_argument("--scale", type=int, help="TPC-H scale factor (overrides config)")
+    p_tpch.add_argument("--keep-local", action="store_true",
+                        help="Download the dataset to tpch-sfN.duckdb and keep it (needed by run_tpch_queries.py) "
+                             "instead of reading it remotely")
     p_tpch.set_defaults(func=cmd_load_tpch)
 
     p_init = sub.add_parser("init-config", help="Write a starter config.yaml")
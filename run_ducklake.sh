@@ -26,6 +26,7 @@ python3 bootstrap_ducklake.py attach --config config.yaml
 
 SCALE_FACTOR=${TPCH_SCALE:-1}
 echo "[+] Loading TPC-H scale factor = ${SCALE_FACTOR}"
-python3 bootstrap_ducklake.py load-tpch --config config.yaml --scale ${SCALE_FACTOR}
+# --keep-local leaves tpch-sf${SCALE_FACTOR}.duckdb on disk for run_tpch_queries.py
+python3 bootstrap_ducklake.py load-tpch --config config.yaml --scale ${SCALE_FACTOR} --keep-local
 
 echo "[✓] DuckLake ready at metadata.ducklake + MinIO s3://ducklake-data/"
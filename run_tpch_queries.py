@@ -1,57 +1,270 @@
 #!/usr/bin/env python3
 import duckdb
-import yaml
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import os
+import re
+
+from bootstrap_ducklake import (
+    download_file, extensions_sql, read_config_cached, sql_literal, tpch_dataset,
+    tune_http,
+)
 
 def load_config(path="config.yaml"):
-    with open(path) as f:
-        return yaml.safe_load(f)
+    return read_config_cached(path)
 
 def open_ducklake(cfg):
     db_path = cfg["metadata"]["duckdb_file"]
     data_path = f"s3://{cfg['storage']['bucket']}/{cfg['storage']['prefix']}"
     alias = cfg["catalog"]["alias"]
 
+    st = cfg["storage"]
+    endpoint = st["endpoint"].replace("http://", "").replace("https://", "")
+
     con = duckdb.connect(database=":memory:")
-    con.execute("INSTALL httpfs; LOAD httpfs;")
-    con.execute("INSTALL aws; LOAD aws;")
-    con.execute("INSTALL ducklake; LOAD ducklake;")
+    # Extensions, secret, ATTACH and USE in a single batch
     con.execute(f"""
+        {extensions_sql(con)}
         CREATE OR REPLACE SECRET minio (
           TYPE S3,
-          KEY_ID '{cfg['storage'].get('access_key', 'minioadmin')}',
-          SECRET '{cfg['storage'].get('secret_key', 'minioadmin')}',
-          ENDPOINT '{cfg['storage']['endpoint'].replace('http://','').replace('https://','')}',
-          URL_STYLE '{cfg['storage'].get('url_style','path')}',
-          USE_SSL {'true' if cfg['storage'].get('use_ssl', False) else 'false'},
-          REGION '{cfg['storage'].get('region','us-east-1')}'
+          KEY_ID {sql_literal(st.get('access_key', 'minioadmin'))},
+          SECRET {sql_literal(st.get('secret_key', 'minioadmin'))},
+          ENDPOINT {sql_literal(endpoint)},
+          URL_STYLE {sql_literal(st.get('url_style', 'path'))},
+          USE_SSL {'true' if st.get('use_ssl', False) else 'false'},
+          REGION {sql_literal(st.get('region', 'us-east-1'))}
         );
+        ATTACH {sql_literal('ducklake:' + db_path)} AS {alias} (DATA_PATH {sql_literal(data_path)});
+        USE {alias};
     """)
-    con.execute(f"ATTACH 'ducklake:{db_path}' AS {alias} (DATA_PATH '{data_path}');")
-    con.execute(f"USE {alias};")
+    tune_http(con)
     return con
 
 def open_reference(scale=1):
-    local_db = f"tpch-sf{scale}.duckdb"
+    # Validation needs the local tpch-sfN.duckdb: the reference is scanned for
+    # every query, so it is never read over HTTP. `load-tpch --keep-local` (as
+    # run_ducklake.sh does) leaves it in place; otherwise it is downloaded here.
+    url, local_db = tpch_dataset(scale)
     if not os.path.exists(local_db):
-        raise FileNotFoundError(
-            f"{local_db} not found — run bootstrap/load first to download it."
-        )
+        print(f"[+] Downloading TPC-H reference dataset from {url} ...")
+        download_file(url, local_db)
     con = duckdb.connect(database=":memory:")
-    con.execute("INSTALL tpch; LOAD tpch;")
-    con.execute(f"ATTACH '{local_db}' AS tpch_ref;")
+    con.execute(f"{extensions_sql(con, ('tpch',))} ATTACH {sql_literal(local_db)} AS tpch_ref (READ_ONLY);")
     return con
 
+TPCH_TABLES = {
+    "customer", "lineitem", "nation", "orders",
+    "part", "partsupp", "region", "supplier",
+}
+
+# SQL tokens: string literals, quoted identifiers and comments are single tokens,
+# so nothing inside them is ever rewritten.
+_TOKEN_RE = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/|[A-Za-z_]\w*|\s+|.",
+    re.DOTALL,
+)
+# Keywords that end a FROM/JOIN table list at the current nesting level
+_FROM_END = {
+    "where", "group", "having", "order", "limit", "offset", "qualify", "window",
+    "union", "intersect", "except", "select",
+}
+
+def _is_word(tok):
+    return tok[0].isalpha() or tok[0] == "_"
+
+def _cte_names(tokens):
+    """
+    Names defined by top-level WITH clauses: an identifier right after WITH,
+    RECURSIVE or a comma, followed by an optional column list and AS [NOT]
+    [MATERIALIZED] (.
+    """
+    sig = [t for t in tokens if not t.isspace() and not t.startswith(("--", "/*"))]
+    names, depth = set(), 0
+    for i, tok in enumerate(sig):
+        if tok == "(":
+            depth += 1
+        elif tok == ")":
+            depth -= 1
+        elif (depth == 0 and _is_word(tok) and i > 0
+              and sig[i - 1].lower() in ("with", "recursive", ",")):
+            j = i + 1
+            if j < len(sig) and sig[j] == "(":
+                # Skip a column list: name(a, b) AS (...)
+                nested = 0
+                while j < len(sig):
+                    nested += {"(": 1, ")": -1}.get(sig[j], 0)
+                    j += 1
+                    if nested == 0:
+                        break
+            if j < len(sig) and sig[j].lower() == "as":
+                j += 1
+                while j < len(sig) and sig[j].lower() in ("not", "materialized"):
+                    j += 1
+                if j < len(sig) and sig[j] == "(":
+                    names.add(tok.lower())
+    return names
+
+def _qualify(sql, catalog):
+    """
+    Prefix TPC-H table references with `catalog.main.` so no USE is needed.
+    Only the eight TPC-H table names are rewritten, and only where a table is
+    expected: right after FROM/JOIN or after a comma in a FROM list, at any
+    subquery depth. Names defined as CTEs are left alone, as are column names
+    in e.g. EXTRACT(year FROM col).
+    """
+    tokens = _TOKEN_RE.findall(sql)
+    tables = TPCH_TABLES - _cte_names(tokens)
+    out = []
+    # Per parenthesis depth: [inside a FROM list, next word is a table position]
+    state = [[False, False]]
+    for i, tok in enumerate(tokens):
+        word = tok.lower()
+        cur = state[-1]
+        if tok == "(":
+            cur[1] = False
+            state.append([False, False])
+        elif tok == ")":
+            if len(state) > 1:
+                state.pop()
+        elif word in ("from", "join"):
+            cur[0] = cur[1] = True
+        elif word in ("on", "using"):
+            # A join condition follows; the FROM list resumes after it, at the
+            # next comma or JOIN
+            cur[1] = False
+        elif word in _FROM_END:
+            cur[0] = cur[1] = False
+        elif tok == "," and cur[0]:
+            cur[1] = True
+        elif cur[1] and _is_word(tok):
+            cur[1] = False
+            following = next((t for t in tokens[i + 1:] if not t.isspace()), "")
+            if word in tables and following not in (".", "("):
+                tok = f"{catalog}.main.{tok}"
+        out.append(tok)
+    return "".join(out)
+
 def run_query(con, sql, alias=None):
+    # TPC-H only: alias qualifies just the eight TPC-H tables (see _qualify)
     if alias:
-        sql = sql.replace("FROM ", f"FROM {alias}.")
-    return con.execute(sql).fetch_df()
+        sql = _qualify(sql, alias)
+    return con.execute(sql).fetch_arrow_table()
+
+def _describe(con, sql):
+    # (name, type) of each result column; binds the query without running it
+    body = sql.strip().rstrip(";")
+    return [(r[0], r[1]) for r in con.execute(f"DESCRIBE SELECT * FROM ({body});").fetchall()]
+
+def _has_float(columns):
+    return any(t in ctype.upper() for _, ctype in columns for t in ("DOUBLE", "FLOAT", "REAL"))
+
+def _checksum(con, sql):
+    # Row count plus the sum of one hash per row, taken over the whole row and its
+    # position: changed values, values swapped between rows and reordering all
+    # change the result.
+    body = sql.strip().rstrip(";")
+    return con.execute(
+        f"WITH _res AS ({body}) SELECT COUNT(*), SUM(HASH(_rn, _res)) "
+        f"FROM (SELECT row_number() OVER () AS _rn, _res FROM _res);"
+    ).fetchone()
+
+def _frames_match(df_ref, df_dl):
+    # Column-wise NumPy comparison; assumes column sets and row counts already match
+    for col in sorted(df_ref.columns):
+        ref, dl = df_ref[col].to_numpy(), df_dl[col].to_numpy()
+        if np.issubdtype(ref.dtype, np.number) and np.issubdtype(dl.dtype, np.number):
+            if not np.allclose(ref, dl, atol=1e-6, equal_nan=True):
+                return False
+            continue
+        # Object/datetime columns: missing values (None/NaN/NaT) must line up,
+        # and the remaining values must be equal
+        ref_na, dl_na = pd.isna(ref), pd.isna(dl)
+        if not np.array_equal(ref_na, dl_na):
+            return False
+        if not np.array_equal(ref[~ref_na], dl[~dl_na]):
+            return False
+    return True
+
+def _mismatch_reason(df_ref, df_dl):
+    # Only used to describe a difference _frames_match already found
+    try:
+        pd.testing.assert_frame_equal(
+            df_ref.sort_index(axis=1),
+            df_dl.sort_index(axis=1),
+            atol=1e-6,
+            check_dtype=False,
+            check_like=True,
+        )
+    except AssertionError as e:
+        detail = str(e).strip().splitlines()
+        if detail:
+            return f"Data mismatch: {detail[0]}"
+    return "Data mismatch"
+
+def _validate_one(ducklake_con, ref_con, alias, q, sql, results_dir):
+    # Each worker gets its own cursors on the shared connections; table names
+    # are fully qualified so no per-cursor USE is required.
+    ref_cur = ref_con.cursor()
+    dl_cur = ducklake_con.cursor()
+    try:
+        ref_sql = _qualify(sql, "tpch_ref")
+        dl_sql = _qualify(sql, alias)
+
+        # Cheap pre-check; only materialize results when the checksums differ.
+        # Renamed columns fall through to the full comparison, and so do results
+        # with floating-point columns: those can differ in the last bits between
+        # engines, so a checksum would usually miss and just run the query twice.
+        ref_cols, dl_cols = _describe(ref_cur, ref_sql), _describe(dl_cur, dl_sql)
+        if (
+            [c for c, _ in ref_cols] == [c for c, _ in dl_cols]
+            and not _has_float(ref_cols + dl_cols)
+            and _checksum(ref_cur, ref_sql) == _checksum(dl_cur, dl_sql)
+        ):
+            print(f"[Q{q:02d}] [✓] Results match")
+            return {"query": f"Q{q:02d}", "match": True, "reason": ""}
+
+        tbl_ref = ref_cur.execute(ref_sql).fetch_arrow_table()
+        tbl_dl = dl_cur.execute(dl_sql).fetch_arrow_table()
+        df_ref = df_dl = None
+
+        match, reason = True, ""
+
+        if tbl_ref.column_names != tbl_dl.column_names:
+            match, reason = False, "Column mismatch"
+        elif tbl_ref.num_rows != tbl_dl.num_rows:
+            match, reason = False, f"Row count mismatch ({tbl_ref.num_rows} vs {tbl_dl.num_rows})"
+        else:
+            cols = sorted(tbl_ref.column_names)
+            if not tbl_ref.select(cols).equals(tbl_dl.select(cols)):
+                # Not bit-identical; convert to pandas for the float-tolerant checks
+                df_ref, df_dl = tbl_ref.to_pandas(), tbl_dl.to_pandas()
+                match = _frames_match(df_ref, df_dl)
+                if not match:
+                    reason = _mismatch_reason(df_ref, df_dl)
+
+        print(f"[Q{q:02d}] [{'✓' if match else '✗'}] {reason or 'Results match'}")
+
+        if not match:
+            (df_ref if df_ref is not None else tbl_ref.to_pandas()).to_csv(
+                results_dir / f"q{q:02d}_ref.csv", index=False)
+            (df_dl if df_dl is not None else tbl_dl.to_pandas()).to_csv(
+                results_dir / f"q{q:02d}_ducklake.csv", index=False)
+
+        return {"query": f"Q{q:02d}", "match": match, "reason": reason}
+
+    except Exception as e:
+        print(f"[x] Error executing Q{q}: {e}")
+        return {"query": f"Q{q:02d}", "match": False, "reason": str(e)}
+    finally:
+        ref_cur.close()
+        dl_cur.close()
 
 def validate_tpch(cfg, scale=1, query_ids=None):
     if not query_ids:
         query_ids = range(1, 23)
+    query_ids = list(query_ids)
 
     ducklake_con = open_ducklake(cfg)
     ref_con = open_reference(scale)
@@ -59,48 +272,18 @@ def validate_tpch(cfg, scale=1, query_ids=None):
     results_dir = Path("tpch_validation")
     results_dir.mkdir(exist_ok=True)
 
-    summary = []
-
-    for q in query_ids:
-        sql = ducklake_con.execute(
-            f"SELECT query FROM tpch_queries() WHERE query_nr={q};"
-        ).fetchone()[0]
-        print(f"\n[Q{q:02d}] Validating...")
-
-        try:
-            ref_con.execute("USE tpch_ref;")
-            df_ref = ref_con.execute(sql).fetch_df()
-            ducklake_con.execute(f"USE {cfg['catalog']['alias']};")
-            df_dl = ducklake_con.execute(sql).fetch_df()
-
-            match, reason = True, ""
-
-            if list(df_ref.columns) != list(df_dl.columns):
-                match, reason = False, "Column mismatch"
-            elif len(df_ref) != len(df_dl):
-                match, reason = False, f"Row count mismatch ({len(df_ref)} vs {len(df_dl)})"
-            else:
-                try:
-                    pd.testing.assert_frame_equal(
-                        df_ref.sort_index(axis=1),
-                        df_dl.sort_index(axis=1),
-                        atol=1e-6,
-                        check_dtype=False,
-                        check_like=True,
-                    )
-                except AssertionError:
-                    match, reason = False, "Data mismatch"
-
-            summary.append({"query": f"Q{q:02d}", "match": match, "reason": reason})
-            print(f"[{'✓' if match else '✗'}] {reason or 'Results match'}")
-
-            if not match:
-                df_ref.to_csv(results_dir / f"q{q:02d}_ref.csv", index=False)
-                df_dl.to_csv(results_dir / f"q{q:02d}_ducklake.csv", index=False)
-
-        except Exception as e:
-            summary.append({"query": f"Q{q:02d}", "match": False, "reason": str(e)})
-            print(f"[x] Error executing Q{q}: {e}")
+    alias = cfg["catalog"]["alias"]
+    # One call to tpch_queries() for all query texts, instead of one per query
+    queries = dict(ducklake_con.execute("SELECT query_nr, query FROM tpch_queries();").fetchall())
+    print(f"[+] Validating {len(query_ids)} queries...")
+
+    # Queries are dominated by S3/MinIO latency on the DuckLake side, so run
+    # them concurrently; map() keeps the summary in query order.
+    with ThreadPoolExecutor(max_workers=min(8, len(query_ids))) as pool:
+        summary = list(pool.map(
+            lambda q: _validate_one(ducklake_con, ref_con, alias, q, queries[q], results_dir),
+            query_ids,
+        ))
 
     pd.DataFrame(summary).to_csv(results_dir / "validation_summary.csv", index=False)
     print("\nValidation summary saved to tpch_validation/validation_summary.csv")